@@ -1,16 +1,68 @@
 import os
+import queue
 import logging
+import threading
 import numpy as np
 import pandas as pd
 import tensorflow as tf
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, train_test_split
 from sklearn.preprocessing import StandardScaler
-from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping, ReduceLROnPlateau
-from typing import Dict, List, Tuple, Any
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+from typing import Dict, List, Tuple, Any, Optional, Union
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Library module: leave handler/level configuration to the application
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+class AsyncWeightCheckpoint(tf.keras.callbacks.Callback):
+    """Save best weights from a background thread so epochs never wait on disk"""
+
+    def __init__(self, directory: str, monitor: str = 'val_loss'):
+        super().__init__()
+        self.directory = directory
+        self.monitor = monitor
+        self.best = np.inf
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = None
+
+    def on_train_begin(self, logs=None):
+        os.makedirs(self.directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def on_epoch_end(self, epoch, logs=None):
+        current = (logs or {}).get(self.monitor)
+        # "not <" rather than ">=" so a diverged (NaN) epoch is never "best"
+        if current is None or not current < self.best:
+            return
+        
+        self.best = current
+        # get_weights returns host copies, so the writer never races training
+        self._queue.put((epoch + 1, self.model.get_weights()))
+
+    def on_train_end(self, logs=None):
+        # Flush pending writes so checkpoints are complete when fit returns
+        self.close()
+
+    def close(self):
+        """Flush queued checkpoints and stop the writer; safe to call twice"""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            epoch, weights = item
+            try:
+                np.savez(os.path.join(self.directory, f'epoch_{epoch}.npz'), *weights)
+            except Exception as e:
+                logger.error("Error saving checkpoint: %s", e)
 
 class MLPipeline:
     def __init__(
@@ -22,12 +74,28 @@ class MLPipeline:
         self.config = config
         self.model_type = model_type
         self.version = version
+        self._log_prefix = f"{model_type} v{version}"
+        self._cache_config()
         self.model = None
-        self.scaler = StandardScaler()
+        self._input_shape = None
+        self._metrics_names = None
+        self._predict_fn = None
+        # copy=False scales X in place in prepare_data; export_int8 passes
+        # copy=True so callers' arrays are never modified
+        self.scaler = StandardScaler(copy=False)
+        self._scaler_fitted = False
         
         # Initialize TensorFlow settings
         self._setup_tensorflow()
 
+    def _cache_config(self):
+        """Hoist frequently read config values into attributes"""
+        self._batch_size = self.config['batch_size']
+        self._random_state = self.config['random_state']
+        self._test_size = self.config['test_size']
+        # XLA compiles training and the predict graph; on unless disabled
+        self._jit_compile = self.config.get('xla_acceleration', True)
+
     def _setup_tensorflow(self):
         """Configure TensorFlow settings"""
         # Enable mixed precision training
@@ -43,59 +111,206 @@ class MLPipeline:
         self,
         data: pd.DataFrame,
         target_column: str,
-        feature_columns: List[str]
+        feature_columns: List[str],
+        refit_scaler: bool = False
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        """Prepare data for training"""
-        logger.info(f"Preparing data for {self.model_type} model")
+        """Prepare data for training, fitting the scaler on first use only"""
+        logger.info("Preparing data for %s model", self._log_prefix)
+        
+        # Split features and target; features go straight to float32 so we
+        # skip the float64 intermediate and halve the bytes fed to the scaler.
+        # copy=True guarantees a private, writable block for in-place scaling
+        # (float32 frames would otherwise hand back a read-only view)
+        X = data[feature_columns].to_numpy(dtype=np.float32, copy=True)
+        y = data[target_column].to_numpy(dtype=np.float32)
         
-        # Split features and target
-        X = data[feature_columns].values
-        y = data[target_column].values
+        # Fit the scaler once and reuse it (e.g. across CV folds)
+        if refit_scaler or not self._scaler_fitted:
+            self.scaler.fit(X)
+            self._scaler_fitted = True
+            self._predict_fn = None
         
-        # Scale features
-        X = self.scaler.fit_transform(X)
+        # Scale features in place (X is already a private float32 copy)
+        X = self.scaler.transform(X)
+        
+        # Cast once to the mixed_float16 compute dtype so Keras doesn't
+        # re-cast every batch; targets stay float32 for loss stability
+        X = X.astype(np.float16)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y,
-            test_size=self.config['test_size'],
-            random_state=self.config['random_state']
+            test_size=self._test_size,
+            random_state=self._random_state
         )
         
         return X_train, X_test, y_train, y_test
 
-    def build_model(self, input_shape: Tuple[int, ...]) -> tf.keras.Model:
-        """Build the neural network model"""
-        logger.info(f"Building {self.model_type} model")
-        
-        if self.model_type == 'engagement_predictor':
-            return self._build_engagement_predictor(input_shape)
-        elif self.model_type == 'quality_analyzer':
-            return self._build_quality_analyzer(input_shape)
-        elif self.model_type == 'content_recommender':
-            return self._build_content_recommender(input_shape)
-        elif self.model_type == 'anomaly_detector':
-            return self._build_anomaly_detector(input_shape)
-        else:
-            raise ValueError(f"Unknown model type: {self.model_type}")
+    def stream_dataset(
+        self,
+        path: str,
+        target_column: str,
+        feature_columns: List[str]
+    ) -> tf.data.Dataset:
+        """Stream a Parquet dataset batch-by-batch instead of loading it into RAM.
 
-    def _build_engagement_predictor(self, input_shape: Tuple[int, ...]) -> tf.keras.Model:
+        The result can be passed straight to train as X_train or X_val.
+        """
+        import pyarrow.dataset as ds
+        
+        logger.info("Streaming data for %s model from %s", self._log_prefix, path)
+        
+        dataset = ds.dataset(path, format='parquet')
+        batch_size = self._batch_size
+        num_features = len(feature_columns)
+        
+        def record_batches(columns: List[str]):
+            return dataset.to_batches(columns=columns, batch_size=batch_size)
+        
+        def to_features(batch) -> np.ndarray:
+            X = np.empty((batch.num_rows, num_features), dtype=np.float32)
+            for i in range(num_features):
+                X[:, i] = batch.column(i).to_numpy(zero_copy_only=False)
+            return X
+        
+        # A streamed dataset can't be fitted in one go, so fit incrementally
+        if not self._scaler_fitted:
+            for batch in record_batches(feature_columns):
+                self.scaler.partial_fit(to_features(batch))
+            self._scaler_fitted = True
+            self._predict_fn = None
+        
+        def generate():
+            for batch in record_batches(feature_columns + [target_column]):
+                X = self.scaler.transform(to_features(batch))
+                y = batch.column(num_features).to_numpy(zero_copy_only=False)
+                yield X.astype(np.float16), y.astype(np.float32)
+        
+        return tf.data.Dataset.from_generator(
+            generate,
+            output_signature=(
+                tf.TensorSpec([None, num_features], tf.float16),
+                tf.TensorSpec([None], tf.float32)
+            )
+        ).prefetch(tf.data.AUTOTUNE)
+
+    def build_streaming_dataset(
+        self,
+        file_pattern: str,
+        target_column: str,
+        feature_columns: List[str],
+        training: bool = True
+    ) -> tf.data.Dataset:
+        """Read sharded TFRecord telemetry in parallel into scaled batches.
+
+        The result can be passed straight to train as X_train (training=True,
+        shards and records shuffled) or X_val (training=False, fixed order).
+        """
+        if not self._scaler_fitted:
+            raise ValueError("Scaler must be fitted before streaming TFRecord shards")
+        
+        logger.info("Streaming data for %s model from %s", self._log_prefix, file_pattern)
+        
+        feature_spec = {
+            name: tf.io.FixedLenFeature([], tf.float32)
+            for name in [*feature_columns, target_column]
+        }
+        mean = tf.constant(self.scaler.mean_, dtype=tf.float32)
+        scale = tf.constant(self.scaler.scale_, dtype=tf.float32)
+        
+        def parse(serialized: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor]:
+            parsed = tf.io.parse_example(serialized, feature_spec)
+            X = tf.stack([parsed[name] for name in feature_columns], axis=1)
+            return tf.cast((X - mean) / scale, tf.float16), parsed[target_column]
+        
+        # Interleave keeps several shards in flight so disk/network reads
+        # overlap; batching before parsing lets parse_example vectorize
+        records = tf.data.Dataset.list_files(
+            file_pattern,
+            shuffle=training,
+            seed=self._random_state
+        ).interleave(
+            tf.data.TFRecordDataset,
+            cycle_length=8,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=not training
+        )
+        
+        # Shards are usually written in time order, so mix records across
+        # them before batching, as _make_dataset does for in-memory data
+        if training:
+            records = records.shuffle(8192, seed=self._random_state)
+        
+        return records.batch(
+            self._batch_size
+        ).map(
+            parse,
+            num_parallel_calls=tf.data.AUTOTUNE
+        ).prefetch(tf.data.AUTOTUNE)
+
+    def partial_fit_scaler(self, data: pd.DataFrame, feature_columns: List[str]):
+        """Incrementally fit the scaler on a chunk of a larger dataset"""
+        self.scaler.partial_fit(data[feature_columns].to_numpy(dtype=np.float32))
+        self._scaler_fitted = True
+        self._predict_fn = None
+
+    def build_model(
+        self,
+        input_shape: Tuple[int, ...],
+        inference_only: bool = False
+    ) -> tf.keras.Model:
+        """Build the neural network model, without Dropout if inference_only"""
+        logger.info("Building %s model", self._log_prefix)
+        
+        # Remembered so load() can rebuild the architecture from weights
+        self._input_shape = tuple(input_shape)
+        
+        try:
+            builder = self._BUILDERS[self.model_type]
+        except KeyError:
+            raise ValueError(f"Unknown model type: {self.model_type}") from None
+        return builder(self, input_shape, inference_only)
+
+    @staticmethod
+    def _input(shape: Tuple[int, ...]) -> tf.Tensor:
+        """Model input in the policy's compute dtype, so float16 batches enter uncast"""
+        return tf.keras.Input(
+            shape=shape,
+            dtype=tf.keras.mixed_precision.global_policy().compute_dtype
+        )
+
+    @staticmethod
+    def _dropout(x: tf.Tensor, rate: float, inference_only: bool) -> tf.Tensor:
+        """Apply dropout, or skip the layer entirely for inference-only models"""
+        if inference_only:
+            return x
+        return tf.keras.layers.Dropout(rate)(x)
+
+    def _build_engagement_predictor(
+        self,
+        input_shape: Tuple[int, ...],
+        inference_only: bool = False
+    ) -> tf.keras.Model:
         """Build engagement prediction model"""
-        inputs = tf.keras.Input(shape=input_shape)
+        inputs = self._input(input_shape)
         
         x = tf.keras.layers.Dense(256, activation='relu')(inputs)
-        x = tf.keras.layers.Dropout(0.3)(x)
+        x = self._dropout(x, 0.3, inference_only)
         x = tf.keras.layers.Dense(128, activation='relu')(x)
-        x = tf.keras.layers.Dropout(0.2)(x)
+        x = self._dropout(x, 0.2, inference_only)
         x = tf.keras.layers.Dense(64, activation='relu')(x)
         
         outputs = tf.keras.layers.Dense(1, activation='sigmoid')(x)
         
         return tf.keras.Model(inputs=inputs, outputs=outputs)
 
-    def _build_quality_analyzer(self, input_shape: Tuple[int, ...]) -> tf.keras.Model:
+    def _build_quality_analyzer(
+        self,
+        input_shape: Tuple[int, ...],
+        inference_only: bool = False
+    ) -> tf.keras.Model:
         """Build quality analysis model"""
-        inputs = tf.keras.Input(shape=input_shape)
+        inputs = self._input(input_shape)
         
         x = tf.keras.layers.Dense(128, activation='relu')(inputs)
         x = tf.keras.layers.Dense(64, activation='relu')(x)
@@ -106,33 +321,36 @@ class MLPipeline:
         
         return tf.keras.Model(inputs=inputs, outputs=[quality_score, issues])
 
-    def _build_content_recommender(self, input_shape: Tuple[int, ...]) -> tf.keras.Model:
+    def _build_content_recommender(
+        self,
+        input_shape: Tuple[int, ...],
+        inference_only: bool = False
+    ) -> tf.keras.Model:
         """Build content recommendation model"""
-        user_input = tf.keras.Input(shape=(input_shape[0],))
-        content_input = tf.keras.Input(shape=(input_shape[1],))
-        
-        # User embedding
-        user_embedding = tf.keras.layers.Dense(64, activation='relu')(user_input)
-        user_embedding = tf.keras.layers.Dropout(0.3)(user_embedding)
-        
-        # Content embedding
-        content_embedding = tf.keras.layers.Dense(64, activation='relu')(content_input)
-        content_embedding = tf.keras.layers.Dropout(0.3)(content_embedding)
+        user_input = self._input((input_shape[0],))
+        content_input = self._input((input_shape[1],))
         
-        # Combine embeddings
-        concatenated = tf.keras.layers.Concatenate()([user_embedding, content_embedding])
+        # Joint user/content embedding: one GEMM over the concatenated
+        # features instead of two separate 64-wide towers
+        concatenated = tf.keras.layers.Concatenate()([user_input, content_input])
+        embedding = tf.keras.layers.Dense(128, activation='relu')(concatenated)
+        embedding = self._dropout(embedding, 0.3, inference_only)
         
-        x = tf.keras.layers.Dense(128, activation='relu')(concatenated)
-        x = tf.keras.layers.Dropout(0.2)(x)
+        x = tf.keras.layers.Dense(128, activation='relu')(embedding)
+        x = self._dropout(x, 0.2, inference_only)
         x = tf.keras.layers.Dense(64, activation='relu')(x)
         
         outputs = tf.keras.layers.Dense(1, activation='sigmoid')(x)
         
         return tf.keras.Model(inputs=[user_input, content_input], outputs=outputs)
 
-    def _build_anomaly_detector(self, input_shape: Tuple[int, ...]) -> tf.keras.Model:
+    def _build_anomaly_detector(
+        self,
+        input_shape: Tuple[int, ...],
+        inference_only: bool = False
+    ) -> tf.keras.Model:
         """Build anomaly detection model"""
-        inputs = tf.keras.Input(shape=input_shape)
+        inputs = self._input(input_shape)
         
         # Encoder
         x = tf.keras.layers.Dense(128, activation='relu')(inputs)
@@ -146,54 +364,193 @@ class MLPipeline:
         
         return tf.keras.Model(inputs=inputs, outputs=outputs)
 
+    # Model type -> unbound builder, resolved once at class creation
+    _BUILDERS = {
+        'engagement_predictor': _build_engagement_predictor,
+        'quality_analyzer': _build_quality_analyzer,
+        'content_recommender': _build_content_recommender,
+        'anomaly_detector': _build_anomaly_detector,
+    }
+
     def train(
         self,
-        X_train: np.ndarray,
-        y_train: np.ndarray,
-        X_val: np.ndarray,
-        y_val: np.ndarray
+        X_train: Union[np.ndarray, tf.data.Dataset],
+        y_train: Optional[np.ndarray],
+        X_val: Union[np.ndarray, tf.data.Dataset],
+        y_val: Optional[np.ndarray]
     ) -> tf.keras.callbacks.History:
-        """Train the model"""
-        logger.info(f"Training {self.model_type} model")
+        """Train the model.
+
+        X_train/X_val may also be batched (features, target) datasets, e.g.
+        from stream_dataset over separate training and validation files;
+        the matching y argument is then None.
+        """
+        logger.info("Training %s model", self._log_prefix)
         
         # Build model if not already built
         if self.model is None:
-            self.model = self.build_model(X_train.shape[1:])
+            if isinstance(X_train, tf.data.Dataset):
+                # Batched features: drop the leading batch dimension
+                input_shape = tuple(X_train.element_spec[0].shape[1:])
+            else:
+                input_shape = X_train.shape[1:]
+            self.model = self.build_model(input_shape)
         
         # Compile model
-        self.model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config['learning_rate']),
-            loss=self.config['loss'],
-            metrics=self.config['metrics']
-        )
+        self._compile_model(self.model)
+        self._metrics_names = None
         
         # Setup callbacks
         callbacks = self._setup_callbacks()
         
         # Train model
-        history = self.model.fit(
-            X_train,
-            y_train,
-            validation_data=(X_val, y_val),
-            batch_size=self.config['batch_size'],
+        try:
+            history = self.model.fit(
+                self._as_dataset(X_train, y_train, training=True),
+                validation_data=self._as_dataset(X_val, y_val, training=False),
+                epochs=self.config['epochs'],
+                callbacks=callbacks,
+                verbose=1
+            )
+        finally:
+            # fit skips on_train_end when it raises; flush checkpoints anyway
+            for callback in callbacks:
+                if isinstance(callback, AsyncWeightCheckpoint):
+                    callback.close()
+        
+        # The traced predict graph may belong to a model built before this call
+        self._predict_fn = None
+        
+        return history
+
+    def cross_validate(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        n_splits: int = 5
+    ) -> List[Dict[str, float]]:
+        """Train and evaluate a fresh model on each cross-validation fold.
+
+        n_splits usually comes from the training config's
+        validation.cross_validation_folds. Without GPUs the folds run
+        concurrently in worker processes; with several GPUs each fold is
+        mirrored across them in turn.
+        """
+        logger.info("Cross-validating %s model over %d folds", self._log_prefix, n_splits)
+        
+        kfold = KFold(
+            n_splits=n_splits,
+            shuffle=True,
+            random_state=self._random_state
+        )
+        
+        gpus = tf.config.list_physical_devices('GPU')
+        if not gpus:
+            # Processes rather than threads so each fold has its own TF
+            # runtime; joblib memory-maps X/y instead of copying per fold
+            from joblib import Parallel, delayed
+            n_jobs = min(n_splits, os.cpu_count() or 1)
+            return Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_cross_validate_fold)(
+                    self.config, self.model_type, self.version,
+                    X, y, train_idx, val_idx, n_jobs
+                )
+                for train_idx, val_idx in kfold.split(X)
+            )
+        
+        # Mirror each fold's training across GPUs when there is more than one
+        if len(gpus) > 1:
+            strategy = tf.distribute.MirroredStrategy()
+        else:
+            strategy = tf.distribute.get_strategy()
+        
+        return [
+            self._fit_fold(X, y, train_idx, val_idx, strategy)
+            for train_idx, val_idx in kfold.split(X)
+        ]
+
+    def _fit_fold(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        train_idx: np.ndarray,
+        val_idx: np.ndarray,
+        strategy: tf.distribute.Strategy
+    ) -> Dict[str, float]:
+        """Train a fresh model on one fold and return its validation metrics"""
+        with strategy.scope():
+            model = self.build_model(X.shape[1:])
+            self._compile_model(model)
+        
+        val_ds = self._make_dataset(X[val_idx], y[val_idx], training=False)
+        model.fit(
+            self._make_dataset(X[train_idx], y[train_idx], training=True),
+            validation_data=val_ds,
             epochs=self.config['epochs'],
-            callbacks=callbacks,
-            verbose=1
+            callbacks=[
+                EarlyStopping(
+                    monitor='val_loss',
+                    patience=self.config['early_stopping_patience'],
+                    restore_best_weights=True
+                )
+            ],
+            verbose=0
         )
         
-        return history
+        results = model.evaluate(val_ds, verbose=0, return_dict=True)
+        return {name: float(value) for name, value in results.items()}
+
+    def _compile_model(self, model: tf.keras.Model):
+        """Compile a model with the configured optimizer, loss and metrics"""
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config['learning_rate']),
+            loss=self.config['loss'],
+            metrics=self.config['metrics'],
+            jit_compile=self._jit_compile
+        )
+
+    def _as_dataset(
+        self,
+        X: Union[np.ndarray, tf.data.Dataset],
+        y: Optional[np.ndarray],
+        training: bool
+    ) -> tf.data.Dataset:
+        """Use a streamed dataset as-is, otherwise build one from arrays"""
+        if isinstance(X, tf.data.Dataset):
+            return X
+        return self._make_dataset(X, y, training)
+
+    def _make_dataset(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        training: bool
+    ) -> tf.data.Dataset:
+        """Build a batched, prefetching input pipeline"""
+        dataset = tf.data.Dataset.from_tensor_slices((X, y))
+        
+        # Reshuffle every epoch for training; evaluation order is irrelevant
+        if training:
+            dataset = dataset.shuffle(8192, seed=self._random_state)
+        
+        # Dropping the ragged last training batch keeps shapes static for XLA,
+        # but only when there is at least one full batch left to train on
+        drop_remainder = training and len(X) >= self._batch_size
+        
+        # Prefetch overlaps the next batch's host-to-device copy with compute
+        return dataset.batch(
+            self._batch_size,
+            drop_remainder=drop_remainder
+        ).prefetch(tf.data.AUTOTUNE)
 
     def _setup_callbacks(self) -> List[tf.keras.callbacks.Callback]:
         """Setup training callbacks"""
         callbacks = []
         
-        # Model checkpoint
-        checkpoint = ModelCheckpoint(
-            f'models/{self.model_type}/v{self.version}/checkpoint',
-            monitor='val_loss',
-            save_best_only=True,
-            mode='min',
-            verbose=1
+        # Model checkpoint (best weights only, written off the training thread)
+        checkpoint = AsyncWeightCheckpoint(
+            f'models/{self.model_type}/v{self.version}',
+            monitor='val_loss'
         )
         callbacks.append(checkpoint)
         
@@ -224,57 +581,174 @@ class MLPipeline:
         y_test: np.ndarray
     ) -> Dict[str, float]:
         """Evaluate the model"""
-        logger.info(f"Evaluating {self.model_type} model")
+        logger.info("Evaluating %s model", self._log_prefix)
         
         # Evaluate model
         results = self.model.evaluate(X_test, y_test, verbose=0)
         
-        # Create metrics dictionary
-        metrics = {}
-        for metric_name, metric_value in zip(self.model.metrics_names, results):
-            metrics[metric_name] = float(metric_value)
+        # Keras only populates metrics_names once the model has run on data,
+        # so resolve it after the first evaluate and reuse it afterwards
+        if self._metrics_names is None:
+            self._metrics_names = tuple(self.model.metrics_names)
         
-        return metrics
+        # Create metrics dictionary
+        return dict(zip(self._metrics_names, map(float, results)))
 
     def save(self, path: str):
-        """Save the model and scaler"""
-        logger.info(f"Saving {self.model_type} model")
+        """Save the model weights, scaler and config as a single bundle"""
+        logger.info("Saving %s model", self._log_prefix)
         
         # Create directories if they don't exist
         os.makedirs(path, exist_ok=True)
         
-        # Save model
-        self.model.save(os.path.join(path, 'model'))
+        # lz4 (de)compresses much faster than zlib; fall back if it's missing
+        try:
+            import lz4  # noqa: F401
+            compress = ('lz4', 3)
+        except ImportError:
+            compress = ('zlib', 3)
         
-        # Save scaler
+        # One file holds everything needed to rebuild the pipeline
         import joblib
-        joblib.dump(self.scaler, os.path.join(path, 'scaler.pkl'))
-        
-        # Save config
-        import json
-        with open(os.path.join(path, 'config.json'), 'w') as f:
-            json.dump(self.config, f)
+        bundle = {
+            'config': self.config,
+            'input_shape': self._input_shape,
+            'weights': self.model.get_weights(),
+            # Plain arrays rather than the pickled sklearn object: cheaper to
+            # load and independent of the installed sklearn version
+            'scaler': {
+                'mean': self.scaler.mean_,
+                'scale': self.scaler.scale_,
+                'var': self.scaler.var_,
+                'n_samples_seen': self.scaler.n_samples_seen_,
+            },
+        }
+        joblib.dump(bundle, os.path.join(path, 'bundle.joblib'), compress=compress)
 
-    def load(self, path: str):
-        """Load the model and scaler"""
-        logger.info(f"Loading {self.model_type} model")
-        
-        # Load model
-        self.model = tf.keras.models.load_model(os.path.join(path, 'model'))
+    def load(self, path: str, for_inference: bool = True):
+        """Load the model weights, scaler and config from a saved bundle.
+
+        With for_inference the architecture is rebuilt without Dropout
+        layers, which have no weights and are identities at inference.
+        """
+        logger.info("Loading %s model", self._log_prefix)
         
-        # Load scaler
         import joblib
-        self.scaler = joblib.load(os.path.join(path, 'scaler.pkl'))
-        
-        # Load config
-        import json
-        with open(os.path.join(path, 'config.json'), 'r') as f:
-            self.config = json.load(f)
+        bundle = joblib.load(os.path.join(path, 'bundle.joblib'))
+        
+        # Config first: the builders and compile read from it
+        self.config = bundle['config']
+        self._cache_config()
+        
+        # Rebuild the architecture and restore weights; the Dropout-free
+        # variant is local to this model, later builds keep their Dropout
+        self.model = self.build_model(bundle['input_shape'], inference_only=for_inference)
+        self.model.set_weights(bundle['weights'])
+        self._compile_model(self.model)
+        self._metrics_names = None
+        self._predict_fn = None
+        
+        # Rebuild the fitted scaler from its state arrays
+        state = bundle['scaler']
+        self.scaler = StandardScaler(copy=False)
+        self.scaler.mean_ = state['mean']
+        self.scaler.scale_ = state['scale']
+        self.scaler.var_ = state['var']
+        self.scaler.n_samples_seen_ = state['n_samples_seen']
+        self.scaler.n_features_in_ = state['mean'].shape[0]
+        self._scaler_fitted = True
+
+    def export_int8(self, path: str, representative_data: np.ndarray):
+        """Export a full-integer TFLite model for CPU serving.
+
+        The exported model expects scaled features quantized with its
+        input tensor's (scale, zero_point).
+        """
+        logger.info("Exporting %s model to int8 TFLite", self._log_prefix)
+        
+        # Calibration feeds one scaled feature matrix; multi-input models
+        # (content_recommender) have no single representative input
+        if len(self.model.inputs) != 1:
+            raise ValueError(
+                f"int8 export supports single-input models only, "
+                f"{self.model_type} has {len(self.model.inputs)} inputs"
+            )
+        
+        # The int8 quantizer needs a float32 graph; mixed_float16 variables
+        # are float32 already, so rebuild and copy the weights across
+        policy = tf.keras.mixed_precision.global_policy()
+        tf.keras.mixed_precision.set_global_policy('float32')
+        try:
+            model = self.build_model(self._input_shape, inference_only=True)
+        finally:
+            tf.keras.mixed_precision.set_global_policy(policy)
+        model.set_weights(self.model.get_weights())
+        
+        # Calibrate activation ranges on scaled samples
+        samples = self.scaler.transform(representative_data[:100], copy=True).astype(np.float32)
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([sample[np.newaxis]] for sample in samples)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        
+        with open(path, 'wb') as f:
+            f.write(converter.convert())
+
+    @staticmethod
+    def load_int8(path: str, num_threads: int = 4) -> tf.lite.Interpreter:
+        """Load an exported int8 TFLite model for CPU inference"""
+        interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+        interpreter.allocate_tensors()
+        return interpreter
 
     def predict(self, X: np.ndarray) -> np.ndarray:
         """Make predictions"""
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        # Make predictions
-        return self.model.predict(X_scaled)
+        # Trace (and XLA-compile) scaling + forward pass once, then reuse it
+        if self._predict_fn is None:
+            model = self.model
+            normalize = self._normalization_layer()
+            self._predict_fn = tf.function(
+                lambda x: model(normalize(x), training=False),
+                input_signature=[tf.TensorSpec([None, X.shape[1]], tf.float32)],
+                jit_compile=self._jit_compile
+            )
+        
+        # Make predictions; raw features stay float32 since unscaled counts
+        # can overflow float16
+        outputs = self._predict_fn(tf.constant(X, dtype=tf.float32))
+        return tf.nest.map_structure(lambda t: t.numpy(), outputs)
+
+    def _normalization_layer(self) -> tf.keras.layers.Normalization:
+        """Bake the fitted scaler into a graph-side normalization layer"""
+        # scale_ (not var_) matches StandardScaler's handling of zero variance;
+        # float32 keeps the raw-feature arithmetic out of float16
+        return tf.keras.layers.Normalization(
+            axis=-1,
+            mean=self.scaler.mean_,
+            variance=np.square(self.scaler.scale_),
+            dtype='float32'
+        )
+
+
+def _cross_validate_fold(
+    config: Dict[str, Any],
+    model_type: str,
+    version: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    n_jobs: int
+) -> Dict[str, float]:
+    """Run one cross-validation fold inside a joblib worker process"""
+    # Share the cores between concurrent folds; a reused worker has already
+    # initialized its runtime and keeps the earlier setting
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(max(1, (os.cpu_count() or 1) // n_jobs))
+    except RuntimeError:
+        pass
+    
+    pipeline = MLPipeline(config, model_type, version)
+    return pipeline._fit_fold(X, y, train_idx, val_idx, tf.distribute.get_strategy())
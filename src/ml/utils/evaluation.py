@@ -1,26 +1,118 @@
 import numpy as np
 import pandas as pd
 import tensorflow as tf
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    roc_auc_score,
-    mean_squared_error,
-    mean_absolute_error,
-    r2_score,
-    confusion_matrix,
-    classification_report
-)
+from sklearn.metrics import roc_auc_score, confusion_matrix
 from typing import Dict, List, Tuple, Any, Optional
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import logging
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; callers fall back to NumPy paths
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+# Test sets up to this many rows are predicted in one direct model call;
+# the bound is on rows because hidden activations are much wider than inputs
+_DIRECT_PREDICT_MAX_ROWS = 8192
+
+# Rank discounts 1 / log2(i + 2), precomputed for cutoffs up to _MAX_K
+_MAX_K = 100
+_DISCOUNTS = 1.0 / np.log2(np.arange(2, _MAX_K + 2, dtype=np.float64))
+
+
+def _discounts(k: int) -> np.ndarray:
+    """Discount vector for the first k ranks"""
+    if k <= _MAX_K:
+        return _DISCOUNTS[:k]
+    return 1.0 / np.log2(np.arange(2, k + 2, dtype=np.float64))
+
+
+@njit(cache=True, fastmath=True)
+def _ndcg_kernel(relevance_scores: np.ndarray, k: int) -> float:
+    """NDCG@k of one ranked list of relevance scores"""
+    n_items = relevance_scores.shape[0]
+    top = min(k, n_items)
+    # Only the k largest scores matter for the ideal ordering
+    ideal = np.sort(np.partition(relevance_scores, n_items - top)[n_items - top:])[::-1]
+    dcg = 0.0
+    idcg = 0.0
+    for i in range(top):
+        discount = _DISCOUNTS[i] if i < _MAX_K else 1.0 / np.log2(i + 2.0)
+        dcg += (2.0 ** relevance_scores[i] - 1.0) * discount
+        idcg += (2.0 ** ideal[i] - 1.0) * discount
+    return dcg / idcg if idcg > 0 else 0.0
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _ndcg_batch(y_true: np.ndarray, topk_idx: np.ndarray, k: int) -> np.ndarray:
+    """Per-query NDCG@k, gathering relevance for the ranked top-k indices"""
+    n_queries, n_items = y_true.shape
+    ndcg = np.empty(n_queries)
+    for q in prange(n_queries):
+        row = y_true[q]
+        ideal = np.sort(np.partition(row, n_items - k)[n_items - k:])[::-1]
+        dcg = 0.0
+        idcg = 0.0
+        for i in range(k):
+            discount = _DISCOUNTS[i] if i < _MAX_K else 1.0 / np.log2(i + 2.0)
+            dcg += (2.0 ** row[topk_idx[q, i]] - 1.0) * discount
+            idcg += (2.0 ** ideal[i] - 1.0) * discount
+        ndcg[q] = dcg / idcg if idcg > 0 else 0.0
+    return ndcg
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _reconstruction_error_kernel(y_true: np.ndarray, y_pred: np.ndarray):
+    """Per-row mean squared error plus its mean/std/min/max.
+
+    The inputs are traversed once; std takes a second pass over the 1-D
+    errors, which is cheap and avoids E[x^2] - mean^2 cancellation.
+    """
+    n_rows, n_cols = y_true.shape
+    errors = np.empty(n_rows)
+    total = 0.0
+    lowest = np.inf
+    highest = -np.inf
+    for i in prange(n_rows):
+        acc = 0.0
+        for j in range(n_cols):
+            # Accumulate in float64 whatever the input precision
+            diff = np.float64(y_true[i, j]) - np.float64(y_pred[i, j])
+            acc += diff * diff
+        error = acc / n_cols
+        errors[i] = error
+        total += error
+        lowest = min(lowest, error)
+        highest = max(highest, error)
+    mean = total / n_rows
+    squared_deviation = 0.0
+    for i in prange(n_rows):
+        deviation = errors[i] - mean
+        squared_deviation += deviation * deviation
+    std = np.sqrt(squared_deviation / n_rows)
+    return errors, mean, std, lowest, highest
+
+
+def _kernel_input(values: np.ndarray) -> np.ndarray:
+    """Pass float32/float64 arrays through as-is; numba has no float16"""
+    values = np.asarray(values)
+    if values.dtype in (np.float32, np.float64):
+        return values
+    return values.astype(np.float32 if values.dtype == np.float16 else np.float64)
+
+
 class ModelEvaluator:
     def __init__(self, model_type: str):
         self.model_type = model_type
@@ -36,8 +128,18 @@ class ModelEvaluator:
     ) -> Dict[str, float]:
         """Evaluate model performance"""
         try:
-            # Get predictions
-            y_pred = model.predict(X_test)
+            # Get predictions; small array inputs skip Keras' predict loop
+            # (dataset construction and per-batch Python overhead), anything
+            # larger or not a plain array (e.g. a DataFrame) is batched
+            inputs = tf.nest.flatten(X_test)
+            if (
+                all(isinstance(x, np.ndarray) for x in inputs)
+                and len(inputs[0]) <= _DIRECT_PREDICT_MAX_ROWS
+            ):
+                outputs = model(tf.nest.map_structure(tf.convert_to_tensor, X_test), training=False)
+                y_pred = tf.nest.map_structure(lambda t: t.numpy(), outputs)
+            else:
+                y_pred = model.predict(X_test, verbose=0)
             
             if self.model_type == 'engagement_predictor':
                 return self._evaluate_binary_classification(y_test, y_pred, threshold)
@@ -61,44 +163,99 @@ class ModelEvaluator:
         threshold: float
     ) -> Dict[str, float]:
         """Evaluate binary classification model"""
-        # Convert probabilities to binary predictions
-        y_pred_binary = (y_pred > threshold).astype(int)
+        y_true = np.ravel(y_true)
+        y_pred = np.ravel(y_pred)
+
+        # Convert probabilities to binary predictions; viewing the bool mask
+        # as uint8 reuses its buffer instead of allocating an int64 copy
+        y_pred_binary = (y_pred > threshold).view(np.uint8)
+
+        # One pass over the labels; every count-based metric follows from it
+        cm = confusion_matrix(y_true, y_pred_binary, labels=[0, 1])
+        tn, fp, fn, tp = cm.ravel()
+        precision, recall, f1 = self._precision_recall_f1(tp, fp, fn)
+        accuracy = float((tp + tn) / cm.sum())
 
         metrics = {
-            'accuracy': accuracy_score(y_true, y_pred_binary),
-            'precision': precision_score(y_true, y_pred_binary),
-            'recall': recall_score(y_true, y_pred_binary),
-            'f1': f1_score(y_true, y_pred_binary),
+            'accuracy': accuracy,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
             'auc_roc': roc_auc_score(y_true, y_pred)
         }
 
         # Store confusion matrix
-        self.evaluation_results['confusion_matrix'] = confusion_matrix(y_true, y_pred_binary)
+        self.evaluation_results['confusion_matrix'] = cm
+        
+        # Store classification report (sklearn's output_dict layout, keyed
+        # by str(label) in the targets' dtype, e.g. '0.0' for float targets)
+        negative, positive = (str(label) for label in np.array([0, 1], dtype=y_true.dtype).tolist())
+        report = {}
+        for label, (label_tp, label_fp, label_fn) in ((negative, (tn, fn, fp)), (positive, (tp, fp, fn))):
+            label_precision, label_recall, label_f1 = self._precision_recall_f1(label_tp, label_fp, label_fn)
+            report[label] = {
+                'precision': label_precision,
+                'recall': label_recall,
+                'f1-score': label_f1,
+                'support': int(label_tp + label_fn)
+            }
+        report['accuracy'] = accuracy
         
-        # Store classification report
-        self.evaluation_results['classification_report'] = classification_report(
-            y_true,
-            y_pred_binary,
-            output_dict=True
-        )
+        total = int(cm.sum())
+        averages = {
+            'macro avg': (0.5, 0.5),
+            'weighted avg': (report[negative]['support'] / total, report[positive]['support'] / total)
+        }
+        for name, weights in averages.items():
+            report[name] = {
+                score: float(weights[0] * report[negative][score] + weights[1] * report[positive][score])
+                for score in ('precision', 'recall', 'f1-score')
+            }
+            report[name]['support'] = total
+        
+        self.evaluation_results['classification_report'] = report
 
         return metrics
 
+    @staticmethod
+    def _precision_recall_f1(tp: int, fp: int, fn: int) -> Tuple[float, float, float]:
+        """Precision, recall and F1 from counts (0.0 where undefined, as sklearn)"""
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return float(precision), float(recall), float(f1)
+
     def _evaluate_regression(
         self,
         y_true: np.ndarray,
         y_pred: np.ndarray
     ) -> Dict[str, float]:
         """Evaluate regression model"""
+        # Align (N, 1) model output with (N,) targets before subtracting
+        y_pred = np.reshape(y_pred, np.shape(y_true))
+
+        # Residuals are computed once and shared by every metric
+        residuals = y_true - y_pred
+        squared = residuals * residuals
+        mse = squared.mean()
+
+        # R^2 per output, averaged (sklearn's uniform_average); a constant
+        # target scores 1.0 when predicted exactly and 0.0 otherwise
+        ss_res = squared.sum(axis=0)
+        ss_tot = np.square(y_true - y_true.mean(axis=0)).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2 = 1.0 - ss_res / ss_tot
+        r2 = np.where(ss_tot > 0, r2, np.where(ss_res > 0, 0.0, 1.0))
+
         metrics = {
-            'mse': mean_squared_error(y_true, y_pred),
-            'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
-            'mae': mean_absolute_error(y_true, y_pred),
-            'r2': r2_score(y_true, y_pred)
+            'mse': float(mse),
+            'rmse': float(np.sqrt(mse)),
+            'mae': float(np.abs(residuals).mean()),
+            'r2': float(np.mean(r2))
         }
 
         # Store residuals
-        self.evaluation_results['residuals'] = y_true - y_pred
+        self.evaluation_results['residuals'] = residuals
         
         # Store prediction vs actual values
         self.evaluation_results['predictions_vs_actual'] = {
@@ -115,14 +272,17 @@ class ModelEvaluator:
         threshold: float
     ) -> Dict[str, float]:
         """Evaluate recommender model"""
-        # Convert probabilities to binary predictions
-        y_pred_binary = (y_pred > threshold).astype(int)
+        # Convert probabilities to binary predictions (uint8 view, no copy)
+        y_pred_binary = (np.ravel(y_pred) > threshold).view(np.uint8)
+
+        _, fp, fn, tp = confusion_matrix(np.ravel(y_true), y_pred_binary, labels=[0, 1]).ravel()
+        precision, recall, f1 = self._precision_recall_f1(tp, fp, fn)
 
         metrics = {
-            'precision': precision_score(y_true, y_pred_binary),
-            'recall': recall_score(y_true, y_pred_binary),
-            'f1': f1_score(y_true, y_pred_binary),
-            'auc_roc': roc_auc_score(y_true, y_pred)
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'auc_roc': roc_auc_score(np.ravel(y_true), np.ravel(y_pred))
         }
 
         # Calculate additional recommender-specific metrics
@@ -136,17 +296,34 @@ class ModelEvaluator:
         y_pred: np.ndarray
     ) -> Dict[str, float]:
         """Evaluate anomaly detection model"""
-        # Calculate reconstruction error
-        reconstruction_error = np.mean(np.square(y_true - y_pred), axis=1)
+        # Calculate reconstruction error and its summary stats
+        if _NUMBA_AVAILABLE:
+            reconstruction_error, mean, std, lowest, highest = _reconstruction_error_kernel(
+                _kernel_input(y_true),
+                _kernel_input(y_pred)
+            )
+        else:
+            # einsum sums squares row-wise without a squared temporary
+            diff = y_true - y_pred
+            reconstruction_error = np.einsum('ij,ij->i', diff, diff) / diff.shape[1]
+            mean = reconstruction_error.mean()
+            std = reconstruction_error.std()
+            lowest = reconstruction_error.min()
+            highest = reconstruction_error.max()
         
-        # Store reconstruction errors for threshold tuning
+        # Store reconstruction errors for threshold tuning, plus the stats
+        # the evaluation report needs so it doesn't recompute them
         self.evaluation_results['reconstruction_error'] = reconstruction_error
+        self.evaluation_results['reconstruction_error_stats'] = {
+            'mean': float(mean),
+            'std': float(std)
+        }
 
         metrics = {
-            'mean_reconstruction_error': np.mean(reconstruction_error),
-            'std_reconstruction_error': np.std(reconstruction_error),
-            'max_reconstruction_error': np.max(reconstruction_error),
-            'min_reconstruction_error': np.min(reconstruction_error)
+            'mean_reconstruction_error': float(mean),
+            'std_reconstruction_error': float(std),
+            'max_reconstruction_error': float(highest),
+            'min_reconstruction_error': float(lowest)
         }
 
         return metrics
@@ -157,25 +334,43 @@ class ModelEvaluator:
         y_pred: np.ndarray,
         k: int = 10
     ) -> Dict[str, float]:
-        """Calculate ranking metrics for recommender systems"""
-        # Sort predictions in descending order
-        pred_indices = np.argsort(-y_pred, axis=0)
+        """Calculate ranking metrics for recommender systems.
+
+        Rows are queries and columns candidate items; a flat score vector
+        is treated as a single ranked list.
+        """
+        y_true = np.asarray(y_true, dtype=np.float64)
+        y_pred = np.asarray(y_pred)
+        if y_pred.ndim == 1 or y_pred.shape[-1] == 1:
+            y_true = y_true.reshape(1, -1)
+            y_pred = y_pred.reshape(1, -1)
+        
+        top = min(k, y_pred.shape[1])
+        
+        # Select the top-k per query in O(m), then order just those k
+        topk_idx = np.argpartition(-y_pred, kth=top - 1, axis=1)[:, :top]
+        order = np.argsort(-np.take_along_axis(y_pred, topk_idx, axis=1), axis=1)
+        topk_idx = np.take_along_axis(topk_idx, order, axis=1)
+        relevance = np.take_along_axis(y_true, topk_idx, axis=1)
+        
+        # Precision@K
+        precision_k = relevance.sum(axis=1) / k
+        
+        # NDCG@K against the ideal (relevance-sorted) ordering
+        if _NUMBA_AVAILABLE:
+            ndcg_k = _ndcg_batch(y_true, topk_idx, top)
+        else:
+            discounts = _discounts(top)
+            dcg = (np.exp2(relevance) - 1.0) @ discounts
+            n_items = y_true.shape[1]
+            ideal = np.partition(y_true, kth=n_items - top, axis=1)[:, n_items - top:]
+            ideal = np.sort(ideal, axis=1)[:, ::-1]
+            idcg = (np.exp2(ideal) - 1.0) @ discounts
+            ndcg_k = np.divide(dcg, idcg, out=np.zeros_like(dcg), where=idcg > 0)
         
-        # Calculate Precision@K
-        precision_k = np.mean([
-            np.sum(y_true[pred_indices[:k]]) / k
-            for pred_indices in pred_indices
-        ])
-
-        # Calculate NDCG@K
-        ndcg_k = np.mean([
-            self._calculate_ndcg(y_true[pred_indices], k)
-            for pred_indices in pred_indices
-        ])
-
         return {
-            f'precision@{k}': precision_k,
-            f'ndcg@{k}': ndcg_k
+            f'precision@{k}': float(precision_k.mean()),
+            f'ndcg@{k}': float(ndcg_k.mean())
         }
 
     def _calculate_ndcg(
@@ -184,19 +379,16 @@ class ModelEvaluator:
         k: int
     ) -> float:
         """Calculate Normalized Discounted Cumulative Gain"""
-        dcg = np.sum([
-            (2 ** relevance_scores[i] - 1) / np.log2(i + 2)
-            for i in range(min(k, len(relevance_scores)))
-        ])
-        
-        # Calculate ideal DCG
-        ideal_relevance_scores = np.sort(relevance_scores)[::-1]
-        idcg = np.sum([
-            (2 ** ideal_relevance_scores[i] - 1) / np.log2(i + 2)
-            for i in range(min(k, len(ideal_relevance_scores)))
-        ])
-        
-        return dcg / idcg if idcg > 0 else 0
+        relevance_scores = np.asarray(relevance_scores, dtype=np.float64)
+        if _NUMBA_AVAILABLE:
+            return float(_ndcg_kernel(relevance_scores, k))
+
+        top = min(k, len(relevance_scores))
+        discounts = _discounts(top)
+        dcg = np.dot(np.exp2(relevance_scores[:top]) - 1.0, discounts)
+        ideal = np.sort(relevance_scores)[::-1][:top]
+        idcg = np.dot(np.exp2(ideal) - 1.0, discounts)
+        return float(dcg / idcg) if idcg > 0 else 0.0
 
     def plot_training_history(
         self,
@@ -204,37 +396,39 @@ class ModelEvaluator:
         save_path: Optional[str] = None
     ):
         """Plot training history"""
+        # Nothing is shown or returned, so without a path there's no work
+        if save_path is None:
+            return
+
         try:
             metrics = history.history
             epochs = range(1, len(metrics['loss']) + 1)
 
-            plt.figure(figsize=(12, 4))
+            # A bare Figure never touches pyplot's global figure manager or
+            # the GUI backend, so evaluations can plot from several threads
+            fig = Figure(figsize=(12, 4))
+            loss_ax, metric_ax = fig.subplots(1, 2)
 
             # Plot training & validation loss
-            plt.subplot(1, 2, 1)
-            plt.plot(epochs, metrics['loss'], 'b-', label='Training Loss')
+            loss_ax.plot(epochs, metrics['loss'], 'b-', label='Training Loss')
             if 'val_loss' in metrics:
-                plt.plot(epochs, metrics['val_loss'], 'r-', label='Validation Loss')
-            plt.title('Model Loss')
-            plt.xlabel('Epoch')
-            plt.ylabel('Loss')
-            plt.legend()
+                loss_ax.plot(epochs, metrics['val_loss'], 'r-', label='Validation Loss')
+            loss_ax.set_title('Model Loss')
+            loss_ax.set_xlabel('Epoch')
+            loss_ax.set_ylabel('Loss')
+            loss_ax.legend()
 
             # Plot training & validation metrics
-            plt.subplot(1, 2, 2)
             for metric in metrics.keys():
                 if metric not in ['loss', 'val_loss']:
-                    plt.plot(epochs, metrics[metric], label=metric)
-            plt.title('Model Metrics')
-            plt.xlabel('Epoch')
-            plt.ylabel('Score')
-            plt.legend()
-
-            plt.tight_layout()
+                    metric_ax.plot(epochs, metrics[metric], label=metric)
+            metric_ax.set_title('Model Metrics')
+            metric_ax.set_xlabel('Epoch')
+            metric_ax.set_ylabel('Score')
+            metric_ax.legend()
 
-            if save_path:
-                plt.savefig(save_path)
-            plt.close()
+            fig.tight_layout()
+            fig.savefig(save_path)
 
         except Exception as e:
             logger.error(f"Error plotting training history: {str(e)}")
@@ -249,20 +443,23 @@ class ModelEvaluator:
             if 'confusion_matrix' not in self.evaluation_results:
                 raise ValueError("Confusion matrix not available")
 
-            plt.figure(figsize=(8, 6))
+            if save_path is None:
+                return
+
+            fig = Figure(figsize=(8, 6))
+            ax = fig.subplots()
             sns.heatmap(
                 self.evaluation_results['confusion_matrix'],
                 annot=True,
                 fmt='d',
-                cmap='Blues'
+                cmap='Blues',
+                ax=ax
             )
-            plt.title('Confusion Matrix')
-            plt.xlabel('Predicted')
-            plt.ylabel('Actual')
+            ax.set_title('Confusion Matrix')
+            ax.set_xlabel('Predicted')
+            ax.set_ylabel('Actual')
 
-            if save_path:
-                plt.savefig(save_path)
-            plt.close()
+            fig.savefig(save_path)
 
         except Exception as e:
             logger.error(f"Error plotting confusion matrix: {str(e)}")
@@ -277,33 +474,32 @@ class ModelEvaluator:
             if 'predictions_vs_actual' not in self.evaluation_results:
                 raise ValueError("Regression results not available")
 
+            if save_path is None:
+                return
+
             y_true = self.evaluation_results['predictions_vs_actual']['y_true']
             y_pred = self.evaluation_results['predictions_vs_actual']['y_pred']
 
-            plt.figure(figsize=(12, 4))
+            fig = Figure(figsize=(12, 4))
+            scatter_ax, residual_ax = fig.subplots(1, 2)
 
             # Scatter plot
-            plt.subplot(1, 2, 1)
-            plt.scatter(y_true, y_pred, alpha=0.5)
-            plt.plot([y_true.min(), y_true.max()], [y_true.min(), y_true.max()], 'r--', lw=2)
-            plt.title('Predicted vs Actual Values')
-            plt.xlabel('Actual Values')
-            plt.ylabel('Predicted Values')
+            scatter_ax.scatter(y_true, y_pred, alpha=0.5)
+            scatter_ax.plot([y_true.min(), y_true.max()], [y_true.min(), y_true.max()], 'r--', lw=2)
+            scatter_ax.set_title('Predicted vs Actual Values')
+            scatter_ax.set_xlabel('Actual Values')
+            scatter_ax.set_ylabel('Predicted Values')
 
             # Residual plot
-            plt.subplot(1, 2, 2)
             residuals = self.evaluation_results['residuals']
-            plt.scatter(y_pred, residuals, alpha=0.5)
-            plt.axhline(y=0, color='r', linestyle='--')
-            plt.title('Residual Plot')
-            plt.xlabel('Predicted Values')
-            plt.ylabel('Residuals')
+            residual_ax.scatter(y_pred, residuals, alpha=0.5)
+            residual_ax.axhline(y=0, color='r', linestyle='--')
+            residual_ax.set_title('Residual Plot')
+            residual_ax.set_xlabel('Predicted Values')
+            residual_ax.set_ylabel('Residuals')
 
-            plt.tight_layout()
-
-            if save_path:
-                plt.savefig(save_path)
-            plt.close()
+            fig.tight_layout()
+            fig.savefig(save_path)
 
         except Exception as e:
             logger.error(f"Error plotting regression results: {str(e)}")
@@ -318,17 +514,22 @@ class ModelEvaluator:
             if 'reconstruction_error' not in self.evaluation_results:
                 raise ValueError("Anomaly detection results not available")
 
+            if save_path is None:
+                return
+
             reconstruction_error = self.evaluation_results['reconstruction_error']
 
-            plt.figure(figsize=(10, 6))
-            sns.histplot(reconstruction_error, bins=50, kde=True)
-            plt.title('Reconstruction Error Distribution')
-            plt.xlabel('Reconstruction Error')
-            plt.ylabel('Count')
+            # Plain binned counts; a KDE overlay costs O(N^2) on large arrays
+            counts, edges = np.histogram(reconstruction_error, bins=50)
 
-            if save_path:
-                plt.savefig(save_path)
-            plt.close()
+            fig = Figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+            ax.set_title('Reconstruction Error Distribution')
+            ax.set_xlabel('Reconstruction Error')
+            ax.set_ylabel('Count')
+
+            fig.savefig(save_path)
 
         except Exception as e:
             logger.error(f"Error plotting anomaly distribution: {str(e)}")
@@ -361,12 +562,18 @@ class ModelEvaluator:
             
             elif self.model_type == 'anomaly_detector':
                 reconstruction_error = self.evaluation_results.get('reconstruction_error', [])
+                stats = self.evaluation_results.get('reconstruction_error_stats') or {
+                    'mean': float(np.mean(reconstruction_error)),
+                    'std': float(np.std(reconstruction_error))
+                }
+                # Both percentiles from a single partition pass
+                p95, p99 = np.percentile(reconstruction_error, [95, 99])
                 report['additional_results']['anomaly_stats'] = {
-                    'mean_error': float(np.mean(reconstruction_error)),
-                    'std_error': float(np.std(reconstruction_error)),
+                    'mean_error': stats['mean'],
+                    'std_error': stats['std'],
                     'percentiles': {
-                        '95th': float(np.percentile(reconstruction_error, 95)),
-                        '99th': float(np.percentile(reconstruction_error, 99))
+                        '95th': float(p95),
+                        '99th': float(p99)
                     }
                 }
 
@@ -1,12 +1,41 @@
+import itertools
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.feature_extraction.text import TfidfVectorizer
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Callable, Union
 import logging
 
+try:
+    import bottleneck as bn
+except ImportError:  # bottleneck is optional; window features fall back to pandas
+    bn = None
+
 logger = logging.getLogger(__name__)
 
+# Custom feature functions referenced by name from 'custom' feature configs.
+# Each receives one NumPy array per input column and returns one array.
+CUSTOM_FEATURE_FUNCTIONS: Dict[str, Callable[..., np.ndarray]] = {}
+
+
+def register_feature_function(name: str, jit: bool = False):
+    """Register a columnar custom feature function under a config name.
+
+    With jit=True the function is compiled with numba when it is installed.
+    """
+    def decorator(func: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        compiled = func
+        if jit:
+            try:
+                from numba import njit
+                compiled = njit(func)
+            except ImportError:
+                logger.warning(f"numba not installed; {name} runs uncompiled")
+        CUSTOM_FEATURE_FUNCTIONS[name] = compiled
+        return func
+    return decorator
+
 class DataPreprocessor:
     def __init__(self):
         self.scalers: Dict[str, Any] = {}
@@ -70,26 +99,25 @@ class DataPreprocessor:
         try:
             processed_data = data.copy()
 
-            # Apply categorical encoding
-            for feature, encoder in self.encoders.items():
+            # Apply categorical encoding (unseen categories map to -1)
+            for feature, categories in self.encoders.items():
                 if feature in processed_data.columns:
-                    processed_data[feature] = encoder.transform(processed_data[feature])
+                    codes = pd.Categorical(processed_data[feature], categories=categories).codes
+                    processed_data[feature] = codes.astype(np.int32)
 
-            # Apply numerical scaling
-            for feature, scaler in self.scalers.items():
-                if feature in processed_data.columns:
-                    processed_data[feature] = scaler.transform(processed_data[feature].values.reshape(-1, 1))
+            # Apply numerical scaling, one block per fitted scaler
+            for scaler, features in self.scalers.values():
+                if all(feature in processed_data.columns for feature in features):
+                    block = processed_data[features].to_numpy(dtype=np.float32)
+                    processed_data[features] = scaler.transform(block)
 
             # Apply text vectorization
+            text_columns, blocks = [], []
             for feature, vectorizer in self.vectorizers.items():
                 if feature in processed_data.columns:
-                    vectorized = vectorizer.transform(processed_data[feature])
-                    feature_names = [f"{feature}_tfidf_{i}" for i in range(vectorized.shape[1])]
-                    processed_data = pd.concat([
-                        processed_data,
-                        pd.DataFrame(vectorized.toarray(), columns=feature_names)
-                    ], axis=1)
-                    processed_data.drop(columns=[feature], inplace=True)
+                    text_columns.append(feature)
+                    blocks.append(vectorizer.transform(processed_data[feature].fillna('')))
+            processed_data = self._replace_text_columns(processed_data, text_columns, blocks)
 
             return processed_data[self.feature_names]
 
@@ -97,26 +125,69 @@ class DataPreprocessor:
             logger.error(f"Error in data transformation: {str(e)}")
             raise
 
+    def to_array(self, processed_data: pd.DataFrame) -> Union[np.ndarray, sparse.csr_matrix]:
+        """Convert processed data to a float32 matrix for model input.
+
+        Returns a C-contiguous array, or a CSR matrix when sparse TF-IDF
+        features are present (feed via tf.sparse / Input(sparse=True)).
+        """
+        features = processed_data[self.feature_names]
+        sparse_columns = {
+            column for column, dtype in features.dtypes.items()
+            if isinstance(dtype, pd.SparseDtype)
+        }
+
+        # Frames assembled column-by-column are column-major; row-wise
+        # inference wants rows contiguous, and float32 halves the footprint
+        if not sparse_columns:
+            return np.ascontiguousarray(features.to_numpy(dtype=np.float32))
+
+        # Stack runs of dense and sparse columns without densifying TF-IDF
+        blocks = []
+        for is_sparse, group in itertools.groupby(self.feature_names, key=sparse_columns.__contains__):
+            columns = list(group)
+            if is_sparse:
+                blocks.append(features[columns].sparse.to_coo())
+            else:
+                blocks.append(sparse.csr_matrix(features[columns].to_numpy(dtype=np.float32)))
+        return sparse.hstack(blocks, format='csr', dtype=np.float32)
+
     def _handle_missing_values(
         self,
         data: pd.DataFrame,
         config: Dict[str, Any]
     ) -> pd.DataFrame:
         """Handle missing values in the dataset"""
+        drop_features: List[str] = []
+        statistic_features: Dict[str, List[str]] = {'mean': [], 'median': [], 'mode': []}
+        fill_values: Dict[str, Any] = {}
+
+        # Bucket features by strategy so each strategy runs once
         for feature, strategy in config.items():
             if feature not in data.columns:
                 continue
 
             if strategy == 'drop':
-                data.dropna(subset=[feature], inplace=True)
-            elif strategy == 'mean':
-                data[feature].fillna(data[feature].mean(), inplace=True)
-            elif strategy == 'median':
-                data[feature].fillna(data[feature].median(), inplace=True)
-            elif strategy == 'mode':
-                data[feature].fillna(data[feature].mode()[0], inplace=True)
+                drop_features.append(feature)
+            elif strategy in statistic_features:
+                statistic_features[strategy].append(feature)
             elif isinstance(strategy, (int, float, str)):
-                data[feature].fillna(strategy, inplace=True)
+                fill_values[feature] = strategy
+
+        # Drop first so fill statistics describe the rows that are kept
+        if drop_features:
+            data.dropna(subset=drop_features, inplace=True)
+
+        if statistic_features['mean']:
+            fill_values.update(data[statistic_features['mean']].mean().to_dict())
+        if statistic_features['median']:
+            fill_values.update(data[statistic_features['median']].median().to_dict())
+        if statistic_features['mode']:
+            fill_values.update(data[statistic_features['mode']].mode().iloc[0].to_dict())
+
+        # A single dict-based fill instead of one chained fillna per column
+        if fill_values:
+            data.fillna(fill_values, inplace=True)
 
         return data
 
@@ -125,14 +196,15 @@ class DataPreprocessor:
         data: pd.DataFrame,
         categorical_features: List[str]
     ) -> pd.DataFrame:
-        """Encode categorical features"""
+        """Encode categorical features as integer codes of their sorted categories"""
         for feature in categorical_features:
             if feature not in data.columns:
                 continue
 
-            encoder = LabelEncoder()
-            data[feature] = encoder.fit_transform(data[feature])
-            self.encoders[feature] = encoder
+            # pandas' hashtable factorization; keep the categories for transform
+            categorical = pd.Categorical(data[feature])
+            data[feature] = categorical.codes.astype(np.int32)
+            self.encoders[feature] = categorical.categories
 
         return data
 
@@ -142,20 +214,23 @@ class DataPreprocessor:
         numerical_features: List[str],
         method: str = 'standard'
     ) -> pd.DataFrame:
-        """Scale numerical features"""
-        for feature in numerical_features:
-            if feature not in data.columns:
-                continue
-
-            if method == 'standard':
-                scaler = StandardScaler()
-            elif method == 'minmax':
-                scaler = MinMaxScaler()
-            else:
-                raise ValueError(f"Unknown scaling method: {method}")
-
-            data[feature] = scaler.fit_transform(data[feature].values.reshape(-1, 1))
-            self.scalers[feature] = scaler
+        """Scale numerical features with one scaler over the whole block"""
+        features = [feature for feature in numerical_features if feature in data.columns]
+        if not features:
+            return data
+
+        if method == 'standard':
+            scaler = StandardScaler()
+        elif method == 'minmax':
+            scaler = MinMaxScaler()
+        else:
+            raise ValueError(f"Unknown scaling method: {method}")
+
+        # sklearn scalers are per-column already, so a single float32 block
+        # replaces one reshape + fit per feature
+        block = data[features].to_numpy(dtype=np.float32)
+        data[features] = scaler.fit_transform(block)
+        self.scalers['numerical'] = (scaler, features)
 
         return data
 
@@ -165,6 +240,7 @@ class DataPreprocessor:
         text_features: List[str]
     ) -> pd.DataFrame:
         """Process text features using TF-IDF"""
+        text_columns, blocks = [], []
         for feature in text_features:
             if feature not in data.columns:
                 continue
@@ -176,18 +252,45 @@ class DataPreprocessor:
                 strip_accents='unicode'
             )
             
-            vectorized = vectorizer.fit_transform(data[feature].fillna(''))
-            feature_names = [f"{feature}_tfidf_{i}" for i in range(vectorized.shape[1])]
-            
-            data = pd.concat([
-                data,
-                pd.DataFrame(vectorized.toarray(), columns=feature_names)
-            ], axis=1)
-            
-            data.drop(columns=[feature], inplace=True)
+            text_columns.append(feature)
+            blocks.append(vectorizer.fit_transform(data[feature].fillna('')))
             self.vectorizers[feature] = vectorizer
 
-        return data
+        return self._replace_text_columns(data, text_columns, blocks)
+
+    def _replace_text_columns(
+        self,
+        data: pd.DataFrame,
+        text_columns: List[str],
+        blocks: List[sparse.spmatrix]
+    ) -> pd.DataFrame:
+        """Swap raw text columns for their TF-IDF blocks in a single concat"""
+        if not blocks:
+            return data
+
+        feature_names = [
+            f"{feature}_tfidf_{i}"
+            for feature, block in zip(text_columns, blocks)
+            for i in range(block.shape[1])
+        ]
+        
+        # One sparse hstack and one concat for all text features; columns
+        # stay sparse-backed instead of densifying mostly-zero TF-IDF
+        tfidf = pd.DataFrame.sparse.from_spmatrix(
+            sparse.hstack(blocks, format='csc'),
+            index=data.index,
+            columns=feature_names
+        )
+        # Newer pandas marks implicit entries as NaN; TF-IDF zeros are zeros
+        tfidf = pd.DataFrame({
+            name: pd.arrays.SparseArray(
+                column.array.sp_values,
+                sparse_index=column.array.sp_index,
+                fill_value=0.0
+            )
+            for name, column in tfidf.items()
+        }, index=data.index)
+        return pd.concat([data.drop(columns=text_columns), tfidf], axis=1)
 
     def _generate_time_features(
         self,
@@ -200,21 +303,25 @@ class DataPreprocessor:
             if feature not in data.columns:
                 continue
 
-            # Convert to datetime if needed
+            # Convert to datetime if needed; stored back so it's parsed once
             if not pd.api.types.is_datetime64_any_dtype(data[feature]):
                 data[feature] = pd.to_datetime(data[feature])
 
-            # Extract common time features
+            # Extract common time features from a single accessor
+            dt = data[feature].dt
             if feature_config.get('hour_of_day', False):
-                data[f"{feature}_hour"] = data[feature].dt.hour
+                data[f"{feature}_hour"] = dt.hour.to_numpy()
+            if feature_config.get('day_of_week', False) or feature_config.get('is_weekend', False):
+                day_of_week = dt.dayofweek.to_numpy()
             if feature_config.get('day_of_week', False):
-                data[f"{feature}_day_of_week"] = data[feature].dt.dayofweek
+                data[f"{feature}_day_of_week"] = day_of_week
             if feature_config.get('month', False):
-                data[f"{feature}_month"] = data[feature].dt.month
+                data[f"{feature}_month"] = dt.month.to_numpy()
             if feature_config.get('year', False):
-                data[f"{feature}_year"] = data[feature].dt.year
+                data[f"{feature}_year"] = dt.year.to_numpy()
             if feature_config.get('is_weekend', False):
-                data[f"{feature}_is_weekend"] = data[feature].dt.dayofweek.isin([5, 6]).astype(int)
+                # Saturday/Sunday are 5/6: one comparison instead of isin
+                data[f"{feature}_is_weekend"] = (day_of_week >= 5).astype(np.int8)
 
             # Drop original time feature if specified
             if feature_config.get('drop_original', True):
@@ -251,19 +358,27 @@ class DataPreprocessor:
         features = config['features']
         operations = config.get('operations', ['multiply'])
 
+        # Pull the inputs out once as a contiguous block; every operation
+        # then runs as a single NumPy kernel without pandas dispatch
+        block = data[features].to_numpy(dtype=np.float64)
+        first = block[:, 0]
+        second = block[:, 1] if block.shape[1] > 1 else None
+
         for op in operations:
             if op == 'multiply':
                 feature_name = f"{'_x_'.join(features)}"
-                data[feature_name] = data[features].prod(axis=1)
+                # nanprod/nansum keep pandas' skipna semantics
+                data[feature_name] = np.nanprod(block, axis=1)
             elif op == 'divide':
                 feature_name = f"{features[0]}_div_{features[1]}"
-                data[feature_name] = data[features[0]] / data[features[1]].replace(0, np.nan)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    data[feature_name] = np.where(second == 0, np.nan, first / second)
             elif op == 'add':
                 feature_name = f"{'_plus_'.join(features)}"
-                data[feature_name] = data[features].sum(axis=1)
+                data[feature_name] = np.nansum(block, axis=1)
             elif op == 'subtract':
                 feature_name = f"{features[0]}_minus_{features[1]}"
-                data[feature_name] = data[features[0]] - data[features[1]]
+                data[feature_name] = first - second
 
         return data
 
@@ -295,16 +410,22 @@ class DataPreprocessor:
         operations = config.get('operations', ['mean'])
 
         for feature in features:
+            # Load the column once for every operation on it
+            values = data[feature].to_numpy(dtype=np.float64)
+            rolling = data[feature].rolling(window=window_size)
+
             for op in operations:
+                if op not in ('mean', 'std', 'min', 'max'):
+                    continue
+
                 feature_name = f"{feature}_{op}_{window_size}w"
-                if op == 'mean':
-                    data[feature_name] = data[feature].rolling(window=window_size).mean()
+                if bn is None:
+                    data[feature_name] = getattr(rolling, op)()
                 elif op == 'std':
-                    data[feature_name] = data[feature].rolling(window=window_size).std()
-                elif op == 'min':
-                    data[feature_name] = data[feature].rolling(window=window_size).min()
-                elif op == 'max':
-                    data[feature_name] = data[feature].rolling(window=window_size).max()
+                    # pandas' rolling std is the sample std
+                    data[feature_name] = bn.move_std(values, window=window_size, ddof=1)
+                else:
+                    data[feature_name] = getattr(bn, f"move_{op}")(values, window=window_size)
 
         return data
 
@@ -313,10 +434,14 @@ class DataPreprocessor:
         data: pd.DataFrame,
         config: Dict[str, Any]
     ) -> pd.DataFrame:
-        """Create custom features using provided lambda functions"""
+        """Create custom features using registered columnar functions"""
         feature_name = config['name']
-        function = eval(config['function'])  # Be careful with eval!
-        features = config['features']
+        try:
+            function = CUSTOM_FEATURE_FUNCTIONS[config['function']]
+        except KeyError:
+            raise ValueError(f"Unknown custom feature function: {config['function']}") from None
 
-        data[feature_name] = data[features].apply(function, axis=1)
+        # One call over whole columns instead of a Python call per row
+        columns = [data[feature].to_numpy() for feature in config['features']]
+        data[feature_name] = function(*columns)
         return data